@@ -1,20 +1,113 @@
 import errno
-from time import sleep
+import math
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from functools import lru_cache
+from io import BytesIO
+from shutil import copyfileobj
+from types import MappingProxyType
+from urllib.parse import urlparse
 from zipfile import ZipFile
 
+import orjson
 import requests
 import argparse
 import sys
 
 from pyunpack import Archive
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
+from urllib3.util.retry import Retry
 from datetime import datetime
-from os import path, makedirs, remove, listdir, rmdir
+from os import path, makedirs, remove, listdir, rmdir, cpu_count, walk, replace
 
 DEMOZOO_API_ENDPOINT = 'https://demozoo.org/api/v1/'
 DEMOZOO_PRODS_ENDPOINT = 'productions/'
 DEMOZOO_PLATFORMS_ENDPOINT = 'platforms/'
+PLATFORMS_CACHE_FILE = path.join(path.expanduser('~'), '.cache', 'dpbuilder', 'platforms.json')
 FIELDS = ['release_date', 'title', 'author_nicks', 'download_links', 'demozoo_url', 'url']
+# (offset, signature, extension)
+ARCHIVE_SIGNATURES = [
+    (0, b'PK\x03\x04', '.zip'),
+    (0, b'PK\x05\x06', '.zip'),
+    (0, b'PK\x07\x08', '.zip'),
+    (0, b'Rar!\x1A\x07\x00', '.rar'),
+    (0, b'Rar!\x1A\x07\x01\x00', '.rar'),
+    (0, b'7z\xBC\xAF\x27\x1C', '.7z'),
+    (0, b'\x1F\x8B\x08', '.gz'),
+    (0, b'BZh', '.bz2'),
+    (0, b'LZX', '.lzx'),
+    (0, b'\xFD7zXZ\x00', '.xz'),
+    # LHA headers start with the header size and checksum, followed by the method ID (-lh5-, -lz4-, ...)
+    (2, b'-lh', '.lha'),
+    (2, b'-lz', '.lha'),
+]
+SIGNATURE_HEADER_SIZE = 16
+
+# Group the signatures by position, so each one is a single dict lookup on a slice of the header
+SIGNATURE_BUCKETS = {}
+for _offset, _signature, _ext in ARCHIVE_SIGNATURES:
+    SIGNATURE_BUCKETS.setdefault((_offset, len(_signature)), {})[_signature] = _ext
+
+DEFAULT_JOBS = 8
+MAX_JOBS = 16
+MAX_CONNECTIONS_PER_HOST = 8
+MAX_PAGE_FETCHES = 4
+MAX_DOWNLOADS_PER_HOST = 4
+# Write downloads to disk in 1 MiB blocks, to save on write calls
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Downloads up to this size are kept in memory when they get extracted (see download_prod)
+MAX_IN_MEMORY_SIZE = 32 * 1024 * 1024
+
+# Shared session, so connections are reused between requests (concurrency is bounded by the host semaphores)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16,
+                       pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                       max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                                         raise_on_status=False))
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+# requests already asks for compressed responses (gzip, deflate, and br once brotli is installed)
+SESSION.headers.update({'User-Agent': 'DPBuilder/1.0'})
+
+# Limit the number of simultaneous downloads from a single host, to stay polite
+host_semaphores = defaultdict(lambda: threading.BoundedSemaphore(MAX_DOWNLOADS_PER_HOST))
+host_semaphores_lock = threading.Lock()
+
+# Demozoo can return the same prod on several pages (e.g. collaborations), so keep track of the downloaded URLs
+seen_urls = set()
+seen_urls_lock = threading.Lock()
+
+
+def get_host_semaphore(url):
+    with host_semaphores_lock:
+        return host_semaphores[urlparse(url).netloc]
+
+
+def claim_url(url):
+    """Return True if the url isn't downloaded (or being downloaded) yet during this run, and mark it as such"""
+    with seen_urls_lock:
+        if url in seen_urls:
+            return False
+        seen_urls.add(url)
+        return True
+
+
+def release_url(url):
+    """Unmark a url after a failed download, so other entries with the same link can still try it"""
+    with seen_urls_lock:
+        seen_urls.discard(url)
+
+
+def is_downloaded(file_path, expected_size):
+    """Return True if file_path exists and has the expected size (or any size, if that is unknown)"""
+    if not path.isfile(file_path):
+        return False
+    file_size = path.getsize(file_path)
+    return file_size > 0 and (expected_size == 0 or file_size == expected_size)
 
 
 def parse_date(date_string):
@@ -24,6 +117,15 @@ def parse_date(date_string):
     except ValueError:
         raise argparse.ArgumentTypeError(f"Invalid date format: {date_string}. Expected YYYY-MM-DD.")
 
+def job_count(string):
+    try:
+        jobs = int(string)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid number of jobs: {string}.")
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"Invalid number of jobs: {string}. Expected at least 1.")
+    return jobs
+
 def dir_path(string):
     if path.isdir(string):
         return string
@@ -35,66 +137,104 @@ def dir_path(string):
             if exception.errno != errno.EEXIST:
                 raise
 
+def get_archive_type(header):
+    """Return the archive extension matching the given file header, or None"""
+    for (offset, length), signatures in SIGNATURE_BUCKETS.items():
+        ext = signatures.get(header[offset:offset + length])
+        if ext:
+            return ext
+    return None
+
+
 def check_file_signature(file_path):
     """Return the filetype signature"""
     if not path.isfile(file_path):
         return None
     with open(file_path, 'rb') as f:
-        signature = f.read(4)
-
-    sig_ext_map = {
-        b'PK\x03\x04': '.zip',
-        b'PK\x05\x06': '.zip',
-        b'PK\x07\x08': '.zip',
-        b'Rar!\x1A\x07\x00': '.rar',
-        b'Rar!\x1A\x07\x01\x00': '.rar',
-        b'7z\xBC\xAF\x27\x1C': '.7z',
-        b'\x1F\x8B\x08': '.gz',
-        b'BZh': '.bz2',
-        b'-lh': '.lha',
-        b'LZX': '.lzx',
-        b'\xFD7zXZ\x00': '.xz'
-    }
-
-    if signature in sig_ext_map:
-        return sig_ext_map[signature]
-    else:
-        return None
+        header = f.read(SIGNATURE_HEADER_SIZE)
+
+    return get_archive_type(header)
 
 
 def verify_extraction(expected_files, destination_dir):
     """Verify if all expected files have been extracted."""
+    # Walk the destination once, instead of checking every expected file separately
+    present = set()
+    for root, folders, files in walk(destination_dir):
+        for name in folders + files:
+            present.add(path.relpath(path.join(root, name), destination_dir))
+
     for file in expected_files:
-        extracted_file_path = path.join(destination_dir, file)
-        if not path.exists(extracted_file_path):
+        if path.normpath(file) not in present:
             return False, file
     return True, None
 
 
-def extract_with_progress(archive_file, destination_dir):
-    file_type = check_file_signature(archive_file)
+def zip_member_parent(member_name, destination_dir):
+    """Return the folder a ZIP member is extracted to, sanitized the same way ZipFile.extract does"""
+    parts = [part for part in member_name.split('/')[:-1] if part not in ('', '.', '..')]
+    return path.join(destination_dir, *parts)
+
+
+def save_archive_buffer(archive_buffer, archive_file):
+    """Write an in-memory archive to disk, e.g. so the user can extract it manually when extraction failed"""
+    with open(archive_file, 'wb') as f:
+        f.write(archive_buffer.getbuffer())
+
+
+def extract_with_progress(archive_file, destination_dir, archive_buffer=None, keep_archive=False):
+    """Extract archive_file to destination_dir.
+    If archive_buffer holds the downloaded archive, ZIP files are extracted straight from memory.
+    Other formats are written to archive_file first, since patool/pyunpack needs a file to work with."""
+    if archive_buffer is not None:
+        archive_buffer.seek(0)
+        file_type = get_archive_type(archive_buffer.read(SIGNATURE_HEADER_SIZE))
+        archive_buffer.seek(0)
+        in_memory = file_type == '.zip'
+        if not in_memory:
+            save_archive_buffer(archive_buffer, archive_file)
+    else:
+        file_type = check_file_signature(archive_file)
+        in_memory = False
+
     if not file_type in ['.zip', '.rar', '.7z', '.lha', '.lzx', '.tar', '.gz', '.bz2']:
         print(f'File {archive_file} is not a valid archive file. Skipping extraction.')
         return
     # Ensure the destination directory exists
     makedirs(destination_dir, exist_ok=True)
+    remove_archive = not (in_memory or keep_archive)
 
     # For ZIP files, get a list of files in the archive
     if file_type == '.zip':
-        with ZipFile(archive_file, 'r') as zip_ref:
-            file_list = zip_ref.namelist()
-            with tqdm(total=len(file_list), desc="Extracting") as pbar:
-                for file in file_list:
-                    zip_ref.extract(file, path=destination_dir)
-                    pbar.update(1)
+        try:
+            with ZipFile(archive_buffer if in_memory else archive_file, 'r') as zip_ref:
+                file_list = zip_ref.namelist()
+                # Create the folder structure up front, so the workers don't race each other creating it
+                for folder in {zip_member_parent(file, destination_dir) for file in file_list}:
+                    makedirs(folder, exist_ok=True)
+                # Members are independent and zlib releases the GIL while inflating, so extract them in parallel
+                with ThreadPoolExecutor(max_workers=cpu_count()) as pool:
+                    futures = [pool.submit(zip_ref.extract, file, path=destination_dir) for file in file_list]
+                    for future in tqdm(as_completed(futures), total=len(futures), desc="Extracting", leave=False):
+                        future.result()
+        except Exception as e:
+            print(f"Extraction failed for {archive_file}: {e}")
+            if in_memory:
+                save_archive_buffer(archive_buffer, archive_file)
+            return
 
         # Verify extraction
         success, failed_file = verify_extraction(file_list, destination_dir)
         if success:
-            print(f"All files extracted successfully for {archive_file}. Removing archive.")
-            remove(archive_file)
+            if remove_archive:
+                print(f"All files extracted successfully for {archive_file}. Removing archive.")
+                remove(archive_file)
+            else:
+                print(f"All files extracted successfully for {archive_file}.")
         else:
             print(f"Extraction failed for {archive_file}. Missing file: {failed_file}")
+            if in_memory:
+                save_archive_buffer(archive_buffer, archive_file)
 
     else:
         # For other formats, we'll need a different approach since patool/pyunpack doesn't directly expose file lists
@@ -102,32 +242,76 @@ def extract_with_progress(archive_file, destination_dir):
         # Verify extraction by checking the presence of at least one file
         extracted_files = listdir(destination_dir)
         if extracted_files:
-            print(f"Extraction complete for: {archive_file}. Removing archive.")
-            remove(archive_file)
+            if remove_archive:
+                print(f"Extraction complete for: {archive_file}. Removing archive.")
+                remove(archive_file)
+            else:
+                print(f"Extraction complete for: {archive_file}.")
         else:
             print(f"Extraction failed for: {archive_file}. No files were extracted.")
 
 
-def fuzzy_search(query, platforms):
+def fuzzy_search(query):
+    """Return the (id, name) of the shortest platform name containing the query, or None"""
     query_lower = query.lower()
-    best_match = None
-    best_match_length = float('inf')  # Start with a large number
+    platform_index = get_platform_index()
 
-    for platform_id, platform_name in platforms.items():
-        platform_name_lower = platform_name.lower()
-        if query_lower in platform_name_lower:
-            current_length = len(platform_name_lower)
-            if current_length < best_match_length:
-                best_match = (platform_id, platform_name)
-                best_match_length = current_length
+    # Short-circuit exact matches
+    for platform_name_lower, _, platform_id, platform_name in platform_index:
+        if platform_name_lower == query_lower:
+            return platform_id, platform_name
 
-    return best_match
+    matches = [(platform_id, platform_name, name_length)
+               for platform_name_lower, name_length, platform_id, platform_name in platform_index
+               if query_lower in platform_name_lower]
+    if not matches:
+        return None
+
+    # Prefer the shortest (most specific) name
+    return min(matches, key=lambda match: match[2])[:2]
+
+def fetch_json(url):
+    req = SESSION.get(url)
+    req.raise_for_status()
+    # orjson parses the (large) production pages a lot faster than the stdlib json module
+    return orjson.loads(req.content)
 
+def load_platforms_cache():
+    """Return the cached {'etag': ..., 'results': [...]} platform data, or None if there is no usable cache"""
+    try:
+        with open(PLATFORMS_CACHE_FILE, 'rb') as f:
+            cache = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not cache.get('etag') or 'results' not in cache:
+        return None
+    return cache
+
+def save_platforms_cache(etag, results):
+    try:
+        makedirs(path.dirname(PLATFORMS_CACHE_FILE), exist_ok=True)
+        with open(PLATFORMS_CACHE_FILE, 'wb') as f:
+            f.write(orjson.dumps({'etag': etag, 'results': results}))
+    except OSError as e:
+        # The cache only saves a request, so don't fail over it
+        print(f"Could not write the platform cache: {e}")
+
+@lru_cache(maxsize=1)
 def get_platforms():
+    """Return a read-only {id: name} mapping of the Demozoo platforms, fetched once per run"""
     print('Fetching platform data...')
     try:
-        req = requests.get(DEMOZOO_API_ENDPOINT + DEMOZOO_PLATFORMS_ENDPOINT)
-        data = req.json()['results']
+        # The platform list rarely changes, so only download it when it differs from the cached copy
+        cache = load_platforms_cache()
+        headers = {'If-None-Match': cache['etag']} if cache else {}
+        req = SESSION.get(DEMOZOO_API_ENDPOINT + DEMOZOO_PLATFORMS_ENDPOINT, headers=headers)
+        if req.status_code == 304:
+            data = cache['results']
+        else:
+            req.raise_for_status()
+            data = orjson.loads(req.content)['results']
+            if req.headers.get('ETag'):
+                save_platforms_cache(req.headers['ETag'], data)
         # Sort platforms by ID
         data.sort(key=lambda x: x['id'])
         # Sanitize data into a single dict
@@ -136,11 +320,21 @@ def get_platforms():
         for platform in data:
             platforms[platform['id']] = platform['name']
 
-        return platforms
+        # The result is cached, so don't let callers modify it
+        return MappingProxyType(platforms)
     except requests.exceptions.ConnectionError:
-        print("There was an error connecting to Demozoo. :(")
-
-def get_prods_list(**kwargs):
+        # Exit rather than return None, which lru_cache would keep for the rest of the run
+        sys.exit("There was an error connecting to Demozoo. :(")
+
+@lru_cache(maxsize=1)
+def get_platform_index():
+    """Return (lowercase name, name length, id, name) tuples for all platforms, used by fuzzy_search"""
+    return tuple((platform_name.lower(), len(platform_name), platform_id, platform_name)
+                 for platform_id, platform_name in get_platforms().items())
+
+def iter_prods_list(**kwargs):
+    """Return the number of matching prods, and a generator yielding them page by page.
+    Only the first page is fetched up front, so downloads can start before all pages are in."""
     platform_id = 0
     filters = []
 
@@ -148,7 +342,7 @@ def get_prods_list(**kwargs):
         print(f"Using Demozoo platform ID {kwargs['platform_id']}: {get_platforms()[kwargs['platform_id']]} ")
         platform_id = kwargs['platform_id']
     elif 'platform' in kwargs and kwargs['platform'] is not None:
-        match_platform = fuzzy_search(kwargs['platform'], get_platforms())
+        match_platform = fuzzy_search(kwargs['platform'])
         print(f'Matched with Demozoo platform ID {match_platform[0]}: {match_platform[1]}')
         platform_id = match_platform[0]
 
@@ -177,58 +371,60 @@ def get_prods_list(**kwargs):
 
     print('Fetching data from Demozoo...')
     fetch_url = DEMOZOO_API_ENDPOINT + DEMOZOO_PRODS_ENDPOINT + '?' + filters_str + "&fields=" + fields
-    req = requests.get(fetch_url)
-    data = req.json()
-    results = []
+    data = fetch_json(fetch_url)
     entry_count = data['count']
 
     print(f'Found {entry_count} entries.')
 
-    next_url = data['next']
-    current_page = 1
-    if next_url is not None:
-        while next_url is not None:
-            results.extend(data['results'])
-            print(f'Fetching page {current_page}')
-            req = requests.get(next_url)
-            data = req.json()
-            next_url = data['next']
-            current_page += 1
-        results.extend(data['results'])
-        sleep(2)  # Rudimentary rate limiting
+    return entry_count, iter_pages(fetch_url, data)
+
+def iter_pages(fetch_url, first_page):
+    """Yield the prods of all result pages, starting with the already fetched first page"""
+    fetched = len(first_page['results'])
+    yield from first_page['results']
+    if first_page['next'] is not None:
+        # The page size and entry count are known after the first page, so fetch the remaining pages concurrently
+        page_size = len(first_page['results'])
+        total_pages = math.ceil(first_page['count'] / page_size)
+        print(f'Fetching {total_pages - 1} more pages')
+        page_urls = [f'{fetch_url}&page={page}' for page in range(2, total_pages + 1)]
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_FETCHES) as pool:
+            for page_data in pool.map(fetch_json, page_urls):
+                fetched += len(page_data['results'])
+                yield from page_data['results']
+
+    print(f'Fetched {fetched} entries.')
+
+def get_author_field(prod):
+    if len(prod['author_nicks']) > 0:
+        return prod['author_nicks'][0]['name']
     else:
-        results.extend(data['results'])
-
-    print(f'Fetched {len(results)} entries.')
+        return '_UNSORTED'
 
-    return results
+def get_prod_folder(prod, root_dir):
+    """Return the folder a prod gets downloaded to: <root_dir>/<year>/<author>"""
+    return path.join(root_dir, prod['release_date'][:4], get_author_field(prod))
 
-def download_prod(prod, cur_prod=1, total_prods=1, root_dir=None, extract=False):
+def download_prod(prod, cur_prod=1, total_prods=1, root_dir=None, extract=False, keep_archive=False):
+    """Download a prod to its folder, which is expected to exist already (see main)"""
     prod_name = prod['title']
-    if len(prod['author_nicks']) > 0:
-        author_field = prod['author_nicks'][0]['name']
-    else:
-        author_field = '_UNSORTED'
+    author_field = get_author_field(prod)
 
-    download_links = []
-    if len(prod['download_links']) > 0:
+    download_links = [link['url'] for link in prod['download_links']]
+    if download_links:
         print(f'Found {len(download_links)} links.')
-        for link in prod['download_links']:
-            download_links.append(link['url'])
     else:
         print('No download links found. Skipping entry.')
         return
 
-    release_date = prod['release_date']
+    year = prod['release_date'][:4]
     if author_field == '_UNSORTED':
         by_author = f' (group or author unknown, fill will be downloaded to _UNSORTED folder)'
     else:
         by_author = f' by {author_field}'
-    print(f'[{cur_prod} of {total_prods}] Downloading "{prod_name}"{by_author} ({release_date[:4]})...')
+    print(f'[{cur_prod} of {total_prods}] Downloading "{prod_name}"{by_author} ({year})...')
 
-    folder_path = path.join(root_dir, release_date[:4], author_field)
-    # Create the folder if it doesn't exist
-    makedirs(folder_path, exist_ok=True)
+    folder_path = get_prod_folder(prod, root_dir)
 
     file_name = path.basename(download_links[0])
     # Ensure file_name is not empty
@@ -236,45 +432,80 @@ def download_prod(prod, cur_prod=1, total_prods=1, root_dir=None, extract=False)
         print("Invalid file name extracted from URL.")
         return
 
-    file_path = path.join(str(folder_path), str(file_name))
+    file_path = path.join(folder_path, file_name)
+    # Download to a temporary file, so an interrupted download never looks complete
+    part_path = file_path + '.part'
+
+    extract_dir = path.join(folder_path, prod_name)
+    extracted = path.isdir(extract_dir) and listdir(extract_dir)
+    # A failed extraction leaves the archive behind, so only an extracted folder without archive counts as done
+    if extract and extracted and not path.exists(file_path) and not path.exists(part_path):
+        print(f'"{prod_name}" was extracted before. Skipping entry.')
+        return
+
+    # Downloads are renamed from their .part file once complete, so any file here is a finished download.
+    # This also covers files that are no archive, and so never got an extracted folder.
+    if is_downloaded(file_path, 0):
+        if extract and not (keep_archive and extracted) and check_file_signature(file_path):
+            print(f'{file_name} was downloaded before, but not extracted. Retrying extraction.')
+            extract_with_progress(file_path, extract_dir, keep_archive=keep_archive)
+        else:
+            print(f'{file_name} was downloaded before. Skipping entry.')
+        return
 
     num_links = len(download_links)
     cur_link = 1
     for url in download_links:
         try:
+            if not claim_url(url):
+                print(f'{url} was already downloaded for another entry (or is being downloaded). Skipping entry.')
+                return
             print(f'Trying to download file from URL {cur_link}')
-            req = requests.get(url, stream=True, timeout=10)
-            req.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
-            total_size = int(req.headers.get('content-length', 0))
-            block_size = 1024
-            with tqdm(total=total_size, unit='B', unit_scale=True) as progress_bar:
-                with open(file_path, 'wb') as f:
-                    for chunk in req.iter_content(chunk_size=block_size):
-                        progress_bar.update(len(chunk))
-                        f.write(chunk)
-
-            if total_size != 0 and progress_bar.n != total_size:
+            # Closing the response on every path makes sure an unread response never holds a pool slot
+            with get_host_semaphore(url), SESSION.get(url, stream=True, timeout=10) as req:
+                req.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+                total_size = int(req.headers.get('content-length', 0))
+                # When the archive gets extracted and removed anyway, keep the download in memory instead
+                # of writing it to disk and reading it straight back. Large or unknown sizes go to disk.
+                in_memory = extract and not keep_archive and 0 < total_size <= MAX_IN_MEMORY_SIZE
+                req.raw.decode_content = True
+                with tqdm(total=total_size, unit='B', unit_scale=True, leave=False) as progress_bar:
+                    with nullcontext(BytesIO()) if in_memory else open(part_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                        # Copy in large blocks from the raw response, the progress bar hooks into write()
+                        copyfileobj(req.raw, CallbackIOWrapper(progress_bar.update, f, 'write'), WRITE_BUFFER_SIZE)
+                # Bytes received over the wire, which is what content-length refers to
+                downloaded_size = req.raw.tell()
+
+            # urllib3 normally raises on a truncated body already (see below), this is a fallback
+            if total_size != 0 and downloaded_size != total_size:
                 if num_links > 0 and cur_link < num_links:
                     print(f"File is incomplete... Trying next URL (currently {cur_link} of {num_links}).")
                     cur_link += 1
-                remove(file_path)  # Delete the incomplete file
-                print(f"Deleted incomplete file: {file_path}")
-
-                # Check if the folder is empty
-                if not listdir(str(folder_path)):
-                    rmdir(folder_path)  # Delete the empty folder
-                    print(f"Deleted empty folder: {folder_path}")
+                if not in_memory:
+                    remove(part_path)  # Delete the incomplete file
+                    print(f"Deleted incomplete file: {part_path}")
+                release_url(url)
                 continue
 
+            if not in_memory:
+                replace(part_path, file_path)
             print(f"Succesfully downloaded {file_name}!")
             if extract:
-                extract_with_progress(file_path, path.join(str(folder_path), prod_name))
+                extract_with_progress(file_path,
+                                      extract_dir,
+                                      archive_buffer=f if in_memory else None,
+                                      keep_archive=keep_archive
+                                      )
 
 
             break  # Exit the loop since the download was successful
         except Exception as e:
             print(f"Failed to download {url}: {e}")
-
+            release_url(url)
+            # A truncated body raises while copying, so the incomplete file is cleaned up here
+            if path.exists(part_path):
+                remove(part_path)
+                print(f"Deleted incomplete file: {part_path}")
             continue
 
 
@@ -290,22 +521,46 @@ def main(arguments):
     else:
         # Remove unused arguments
         should_extract = arguments.extract
-        for arg in ['list_platforms', 'extract']: delattr(arguments, arg)
+        keep_archive = arguments.keep_archive
+        jobs = arguments.jobs
+        if jobs > MAX_JOBS:
+            print(f'Limiting the number of simultaneous downloads to {MAX_JOBS}.')
+            jobs = MAX_JOBS
+        for arg in ['list_platforms', 'extract', 'keep_archive', 'jobs']: delattr(arguments, arg)
         # Get prods list using remaining arguments
         args_dict = vars(arguments)
-        prods = get_prods_list(**args_dict)
-
-
-        total_num_prods = len(prods)
-        for num, prod in enumerate(prods, start=1):
-            download_prod(prod,
-                          cur_prod=num,
-                          total_prods=total_num_prods,
-                          root_dir=arguments.output_dir,
-                          extract=should_extract
-                          )
-            sleep(1) # Rudimentary rate limiting
-
+        total_num_prods, prods = iter_prods_list(**args_dict)
+
+        prod_folders = set()
+        # Downloads are network bound, so run them concurrently. Politeness towards
+        # the individual hosts is handled by the per-host semaphores in download_prod.
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = []
+            # Prods are submitted as their page comes in, so downloading starts right after the first page
+            for num, prod in enumerate(prods, start=1):
+                if prod['download_links']:
+                    # Create every year/author folder once, instead of once per prod
+                    folder = get_prod_folder(prod, arguments.output_dir)
+                    if folder not in prod_folders:
+                        makedirs(folder, exist_ok=True)
+                        prod_folders.add(folder)
+
+                futures.append(pool.submit(download_prod,
+                                           prod,
+                                           cur_prod=num,
+                                           total_prods=total_num_prods,
+                                           root_dir=arguments.output_dir,
+                                           extract=should_extract,
+                                           keep_archive=keep_archive
+                                           ))
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading prods"):
+                future.result()
+
+        # Clean up the folders of prods that could not be downloaded
+        for folder in prod_folders:
+            if not listdir(folder):
+                rmdir(folder)  # Delete the empty folder
+                print(f"Deleted empty folder: {folder}")
 
         print("")
         print("--- All done! :) ---")
@@ -328,6 +583,19 @@ if __name__ == '__main__':
                         help="Extract files and remove original archive."
                         )
 
+    parser.add_argument("-k",
+                        "--keep_archive",
+                        action="store_true",
+                        help="Keep the original archive when extracting files."
+                        )
+
+    parser.add_argument("-j",
+                        "--jobs",
+                        type=job_count,
+                        default=DEFAULT_JOBS,
+                        help=f"Number of simultaneous downloads (max. {MAX_JOBS}). Defaults to {DEFAULT_JOBS}."
+                        )
+
     # Create a mutually exclusive group
     arg_group = parser.add_mutually_exclusive_group()
 
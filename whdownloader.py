@@ -1,5 +1,7 @@
 import errno
-from time import sleep
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from shutil import copyfileobj
 from zipfile import ZipFile
 
 import requests
@@ -7,43 +9,67 @@ import argparse
 import sys
 
 from pyunpack import Archive
+from requests.adapters import HTTPAdapter
 from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
+from urllib3.util.retry import Retry
 from datetime import datetime
 from os import path, makedirs, remove, listdir, rmdir
 
-from bs4 import BeautifulSoup
+from lxml import html
 import pandas as pd
 
+COLUMNS = ['Name', 'DownloadURL', 'Info', 'Bytes', 'Date', 'DC', 'Author / Contact', 'BitWorld', 'ADA', 'Pouët',
+           'Images']
+DEFAULT_JOBS = 8
+DOWNLOAD_TIMEOUT = 10
+WRITE_BUFFER_SIZE = 1024 * 1024
+MAX_CONNECTIONS_PER_HOST = 8
+
+# Shared session with keep-alive and retries
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16,
+                       pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+                       max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                                         raise_on_status=False))
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+# requests already asks for compressed responses (gzip, deflate, and br once brotli is installed)
+SESSION.headers.update({'User-Agent': 'DPBuilder/1.0'})
+
+# Limit the number of simultaneous downloads from whdload.de, to be nice to the website :)
+download_semaphore = threading.BoundedSemaphore(4)
+
+
 def get_prod_list():
     print("Fetching data from whdload.de...")
     root_url = "https://www.whdload.de/demos/"
     endpoint = "allv.html"
-    data = requests.get(root_url + endpoint).text
+    data = SESSION.get(root_url + endpoint).text
 
-    soup = BeautifulSoup(data, "html.parser")
+    # lxml parses the (large) table in C, which is a lot faster than walking it with BeautifulSoup
+    tree = html.fromstring(data)
 
-    table = soup.find('table')
-    df = pd.DataFrame(
-        columns=['Name', 'DownloadURL', 'Info', 'Bytes', 'Date', 'DC', 'Author / Contact', 'BitWorld', 'ADA', 'Pouët',
-                 'Images'])
+    table = tree.xpath('//table')[0]
+    rows = []
 
-    for row in table.find_all('tr'):
-        columns = row.find_all('td')
+    for row in table.xpath('.//tr'):
+        columns = row.xpath('.//td')
 
         if columns != []:
-            name = columns[0].text.strip()
-            download_url = root_url + columns[0].find('a')['href']
-            info = columns[1].text.strip()
-            date = columns[2].text.strip()
-            byte_count = columns[3].text.strip()
-            dc = columns[4].text.strip()
-            author = columns[5].text.strip()
-            bitworld = columns[6].text.strip()
-            ada = columns[7].text.strip()
-            pouet = columns[8].text.strip()
-            images = columns[9].text.strip()
-
-            df = pd.concat([df, pd.DataFrame([{
+            name = columns[0].text_content().strip()
+            download_url = root_url + columns[0].xpath('.//a/@href')[0]
+            info = columns[1].text_content().strip()
+            date = columns[2].text_content().strip()
+            byte_count = columns[3].text_content().strip()
+            dc = columns[4].text_content().strip()
+            author = columns[5].text_content().strip()
+            bitworld = columns[6].text_content().strip()
+            ada = columns[7].text_content().strip()
+            pouet = columns[8].text_content().strip()
+            images = columns[9].text_content().strip()
+
+            rows.append({
                 'Name': name,
                 'DownloadURL': download_url,
                 'Info': info,
@@ -55,7 +81,10 @@ def get_prod_list():
                 'ADA': ada,
                 'Pouët': pouet,
                 'Images': images
-            }])], ignore_index=True)
+            })
+
+    # Build the DataFrame in one go, concatenating per row copies the whole frame every time
+    df = pd.DataFrame(rows, columns=COLUMNS)
 
     print(f'Found {len(df)} entries.\n')
     return df
@@ -75,29 +104,34 @@ def download_file(download_url, download_root):
     # Full path where the file will be saved
     file_path = path.join(group_dir, filename)
 
-    # Send a GET request to the URL
-    response = requests.get(download_url, stream=True)
-
-    # Check if the request was successful
-    if response.status_code == 200:
-        # Get the total file size from headers
-        total_size = int(response.headers.get('content-length', 0))
-
-        # Download the file with a progress bar
-        with open(file_path, 'wb') as file, tqdm(
-                desc=filename,
-                total=total_size,
-                unit='B',
-                unit_scale=True,
-                unit_divisor=1024,
-                ncols=80,
-                leave=True
-        ) as bar:
-            for chunk in response.iter_content(chunk_size=1024):
-                file.write(chunk)
-                bar.update(len(chunk))
-    else:
-        print(f"Failed to download {download_url}")
+    writing = False
+    try:
+        # The with block makes sure an unread response never holds a pool slot
+        with download_semaphore, SESSION.get(download_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            # Check if the request was successful
+            if response.status_code == 200:
+                # Get the total file size from headers
+                total_size = int(response.headers.get('content-length', 0))
+
+                # Download the file with a progress bar
+                writing = True
+                with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as file, tqdm(
+                        desc=filename,
+                        total=total_size,
+                        unit='B',
+                        unit_scale=True,
+                        unit_divisor=1024,
+                        ncols=80,
+                        leave=False
+                ) as bar:
+                    response.raw.decode_content = True
+                    copyfileobj(response.raw, CallbackIOWrapper(bar.update, file, 'write'), WRITE_BUFFER_SIZE)
+            else:
+                print(f"Failed to download {download_url}")
+    except Exception as e:
+        print(f"Failed to download {download_url}: {e}")
+        if writing and path.exists(file_path):
+            remove(file_path)  # Delete the incomplete file
 
 
 if __name__ == '__main__':
@@ -106,6 +140,7 @@ if __name__ == '__main__':
     list_df = get_prod_list()
     # for index, row in list_df.iterrows():
     #     print(row['Name'], row['DownloadURL'])
-    for download_url in tqdm(list_df['DownloadURL'], desc="Downloading files"):
-        download_file(download_url, download_dir)
-        sleep(1) # Sleeping a bit to be nice to the website :)
\ No newline at end of file
+    with ThreadPoolExecutor(max_workers=DEFAULT_JOBS) as pool:
+        futures = [pool.submit(download_file, download_url, download_dir) for download_url in list_df['DownloadURL']]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading files"):
+            future.result()